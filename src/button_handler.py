@@ -1,15 +1,27 @@
-import threading
+import concurrent.futures
 import logging
+import os
+import queue
 import select
+import threading
 import time
+from collections import namedtuple
+from datetime import timedelta
+
 import gpiod
 import gpiodevice
 from gpiod.line import Bias, Direction, Edge
-from plugins.plugin_registry import get_plugin_instance
 from PIL import Image
 
+from plugins.base_plugin.base_plugin import BasePlugin
+from plugins.plugin_registry import get_plugin_instance
+from utils.image_utils import compute_image_hash
+
 logger = logging.getLogger(__name__)
 
+# Stand-in for a gpiod edge event, used by simulate_button_press
+SimulatedEvent = namedtuple("SimulatedEvent", ["line_offset"])
+
 class ButtonHandler:
     """Manages physical buttons and delegates actions to active plugin"""
     
@@ -23,7 +35,11 @@ class ButtonHandler:
     LABELS = ["A", "B", "C", "D"]
     
     # Anti-bounce configuration
-    DEBOUNCE_TIME = 0.3  # Seconds between presses of the same button
+    HW_DEBOUNCE_PERIOD = timedelta(milliseconds=20)  # Kernel-side debounce on the GPIO lines
+    DEBOUNCE_TIME_NS = 50_000_000  # Safety net in Python: nanoseconds between presses of the same button
+    
+    # Seconds to wait after the last press before persisting the device config
+    CONFIG_FLUSH_DELAY = 2.0
     
     def __init__(self, device_config, display_manager, refresh_task):
         self.device_config = device_config
@@ -37,13 +53,31 @@ class ButtonHandler:
         self.chip = None
         self.request = None
         self.offsets = None
+        self._offset_to_label = {}
+        self._label_to_offset = {}
         
-        # Anti-bounce: timestamp of last press per button
+        # Anti-bounce: monotonic timestamp (ns) of last press per button
         self.last_press_time = {}
         
-        # Processing lock: prevents multiple simultaneous processing
-        self.processing_lock = threading.Lock()
-        self.is_processing = False
+        # Pending presses for the worker thread
+        self._queue = queue.Queue(maxsize=1)
+        self._worker = None
+        # Held from the moment a press is accepted until the worker finishes it,
+        # so presses arriving while one is in progress are dropped
+        self._busy = threading.Lock()
+        
+        # Deferred config writes: rapid presses are coalesced into a single write
+        self._config_lock = threading.Lock()
+        self._config_dirty = False
+        self._config_timer = None
+        
+        # Background executor for post-display bookkeeping (image hash + config)
+        self._bg_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="InkyBG")
+        
+        # Self-pipe used by stop() to wake up the blocking select() in _run,
+        # opened in start() and closed in stop()
+        self._wakeup_r = None
+        self._wakeup_w = None
         
         logger.info("ButtonHandler initialized with anti-bounce protection")
     
@@ -58,13 +92,21 @@ class ButtonHandler:
             INPUT = gpiod.LineSettings(
                 direction=Direction.INPUT,
                 bias=Bias.PULL_UP,
-                edge_detection=Edge.FALLING
+                edge_detection=Edge.FALLING,
+                debounce_period=self.HW_DEBOUNCE_PERIOD
             )
             
             self.chip = gpiodevice.find_chip_by_platform()
             self.offsets = [self.chip.line_offset_from_id(id) for id in self.BUTTONS]
             line_config = dict.fromkeys(self.offsets, INPUT)
             
+            # Lookup tables so event handling doesn't scan the offsets list
+            self._offset_to_label = {
+                offset: (gpio, label)
+                for offset, gpio, label in zip(self.offsets, self.BUTTONS, self.LABELS)
+            }
+            self._label_to_offset = dict(zip(self.LABELS, self.offsets))
+            
             self.request = self.chip.request_lines(
                 consumer="inkypi-buttons",
                 config=line_config
@@ -72,57 +114,97 @@ class ButtonHandler:
             
             logger.info("GPIO configured correctly for buttons")
             
-            # Start reading thread
+            self._wakeup_r, self._wakeup_w = os.pipe()
+            os.set_blocking(self._wakeup_r, False)
+            os.set_blocking(self._wakeup_w, False)
+            
+            # Start worker and reading threads
             self.running = True
+            self._worker = threading.Thread(target=self._worker_loop, daemon=True, name="ButtonWorker")
+            self._worker.start()
             self.thread = threading.Thread(target=self._run, daemon=True)
             self.thread.start()
             
             logger.info("ButtonHandler started and listening for events")
             
         except Exception as e:
-            logger.error(f"Error starting ButtonHandler: {e}")
+            logger.error("Error starting ButtonHandler: %s", e)
             self.running = False
     
     def stop(self):
         """Stops the button listener"""
         self.running = False
         
+        # Wake up the reading loop so it can exit before the request is released
+        if self._wakeup_w is not None:
+            try:
+                os.write(self._wakeup_w, b"\0")
+            except BlockingIOError:
+                pass  # Pipe already holds a pending wake-up
+        
+        if self.thread:
+            self.thread.join(timeout=2)
+        
+        if self._wakeup_r is not None:
+            os.close(self._wakeup_r)
+            os.close(self._wakeup_w)
+            self._wakeup_r = self._wakeup_w = None
+        
+        if self._worker:
+            # Discard any pending press and ask the worker to exit
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            else:
+                self._busy.release()
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                pass  # Worker is busy; running=False stops it after the current press
+            # Bounded: a plugin call stuck on the network must not hang shutdown; a press
+            # that finishes after this point records its hash inline (see _process_button_async)
+            self._worker.join(timeout=2)
+        
         if self.request:
             self.request.release()
             self.request = None
         
-        if self.thread:
-            self.thread.join(timeout=2)
+        # Let pending hash updates finish, then persist them instead of waiting for the timer
+        self._bg_executor.shutdown(wait=True)
+        self._flush_config()
         
         logger.info("ButtonHandler stopped")
     
     def _run(self):
         """
         Main loop that listens for button events
-        Compatible version: uses select() with timeout
+        Blocks in select() until a button edge arrives or stop() writes to the wake-up pipe
         """
         logger.info("Starting button reading loop (select mode)")
         
         while self.running:
             try:
-                # Use select() to wait for events with timeout
-                fd = self.request.fd
+                readable, _, _ = select.select([self.request.fd, self._wakeup_r], [], [])
                 
-                # Wait up to 0.1 seconds for events
-                readable, _, _ = select.select([fd], [], [], 0.1)
+                if self._wakeup_r in readable:
+                    # Drain the wake-up pipe; the loop condition decides whether to exit
+                    try:
+                        os.read(self._wakeup_r, 64)
+                    except BlockingIOError:
+                        pass
                 
-                if readable:
-                    # Events available, read them
+                if self.request.fd in readable:
                     try:
                         events = self.request.read_edge_events()
                         for event in events:
                             self._handle_button_event(event)
                     except Exception as e:
-                        logger.error(f"Error reading events: {e}")
+                        logger.error("Error reading events: %s", e)
                 
             except Exception as e:
                 if self.running:
-                    logger.error(f"Error in button loop: {e}")
+                    logger.error("Error in button loop: %s", e)
                     time.sleep(0.5)
                 else:
                     break
@@ -136,110 +218,151 @@ class ButtonHandler:
         """
         try:
             # Identify which button was pressed
-            index = self.offsets.index(event.line_offset)
-            gpio_number = self.BUTTONS[index]
-            label = self.LABELS[index]
+            gpio_number, label = self._offset_to_label[event.line_offset]
             
-            current_time = time.time()
+            current_time = time.monotonic_ns()
             
             # PROTECTION 1: Debouncing per button
-            last_time = self.last_press_time.get(label, 0)
-            time_since_last_press = current_time - last_time
+            time_since_last_press = current_time - self.last_press_time.get(label, 0)
             
-            if time_since_last_press < self.DEBOUNCE_TIME:
-                logger.debug(f"Ignoring bounce of button {label} "
-                           f"({time_since_last_press:.2f}s since last press)")
+            if time_since_last_press < self.DEBOUNCE_TIME_NS:
+                logger.debug("Ignoring bounce of button %s (%.2fs since last press)",
+                             label, time_since_last_press / 1e9)
                 return
             
             # Update timestamp of this press
             self.last_press_time[label] = current_time
             
-            # PROTECTION 2: Global processing lock
-            if self.is_processing:
-                logger.warning(f"Button {label} pressed but processing already in progress. Ignoring.")
+            # PROTECTION 2: Drop the press if another one is still pending or being processed
+            if not self._busy.acquire(blocking=False):
+                logger.warning("Button %s pressed but processing already in progress. Ignoring.", label)
                 return
             
-            logger.info(f"Button pressed: {label} (GPIO {gpio_number})")
-            
-            # Mark that we're processing
-            with self.processing_lock:
-                self.is_processing = True
+            self._queue.put_nowait(label)
             
-            # CRITICAL: Process button in a SEPARATE THREAD
-            # This allows the main loop to continue detecting (and rejecting) button presses
-            # while the image is being generated and displayed
-            processing_thread = threading.Thread(
-                target=self._process_button_async,
-                args=(label,),
-                daemon=True,
-                name=f"ButtonProcess-{label}"
-            )
-            processing_thread.start()
+            logger.info("Button pressed: %s (GPIO %s)", label, gpio_number)
             
         except Exception as e:
-            logger.exception(f"Error handling button event: {e}")
-            # Ensure we release the lock in case of error
-            with self.processing_lock:
-                self.is_processing = False
+            logger.exception("Error handling button event: %s", e)
+    
+    def _worker_loop(self):
+        """
+        Processes queued button presses one at a time
+        Runs in a single long-lived thread so the listener never waits on slow plugin work
+        """
+        while self.running:
+            label = self._queue.get()
+            if label is None:
+                break
+            try:
+                self._process_button_async(label)
+            finally:
+                self._busy.release()
+        
+        logger.info("Button worker finished")
     
     def _process_button_async(self, label):
         """
-        Processes button action asynchronously in a separate thread
+        Processes button action in the worker thread
         This is where the potentially slow operations happen
         """
         try:
-            logger.debug(f"Processing button {label} in thread {threading.current_thread().name}")
+            logger.debug("Processing button %s in thread %s", label, threading.current_thread().name)
             
             # Get active plugin info
             refresh_info = self.device_config.get_refresh_info()
             plugin_id = refresh_info.plugin_id if refresh_info else None
             
             if not plugin_id:
-                logger.warning(f"Button {label} pressed but no active plugin")
+                logger.warning("Button %s pressed but no active plugin", label)
                 return
             
             # Get plugin instance
             plugin_config = self.device_config.get_plugin(plugin_id)
             if not plugin_config:
-                logger.error(f"Plugin config {plugin_id} not found")
+                logger.error("Plugin config %s not found", plugin_id)
                 return
             
             plugin = get_plugin_instance(plugin_config)
             
-            # Check if plugin supports buttons
-            if not hasattr(plugin, 'handle_button'):
-                logger.debug(f"Plugin {plugin_id} doesn't support buttons")
+            # Check if plugin supports buttons; BasePlugin.handle_button is a no-op,
+            # so only overrides count as support
+            if type(plugin).handle_button is BasePlugin.handle_button:
+                logger.debug("Plugin %s doesn't support buttons", plugin_id)
                 return
             
             # Call plugin's button handler
-            logger.info(f"Delegating button {label} to plugin {plugin_id}")
-            result = plugin.handle_button(label, self.device_config)
+            logger.info("Delegating button %s to plugin %s", label, plugin_id)
+            result = plugin.handle_button(label, self.device_config, self._get_plugin_settings(refresh_info))
             
             # If plugin returns an image, update the display
             if isinstance(result, Image.Image):
-                logger.info(f"Plugin returned new image, updating display")
+                logger.info("Plugin returned new image, updating display")
                 self.display_manager.display_image(
                     result,
                     image_settings=plugin.config.get("image_settings", [])
                 )
                 
-                # Update image hash in refresh_info
-                from utils.image_utils import compute_image_hash
-                image_hash = compute_image_hash(result)
-                refresh_info.image_hash = image_hash
-                self.device_config.write_config()
+                # Hash and persist in the background so the next press isn't held up
+                try:
+                    self._bg_executor.submit(self._post_display_update, result, refresh_info)
+                except RuntimeError:
+                    # stop() already shut the executor down; update and write the config now
+                    self._post_display_update(result, refresh_info)
+                    self._flush_config()
                 
-                logger.info(f"Display updated after pressing button {label}")
+                logger.info("Display updated after pressing button %s", label)
             elif result is not None:
-                logger.debug(f"Plugin returned: {result}")
+                logger.debug("Plugin returned: %s", result)
             
         except Exception as e:
-            logger.exception(f"Error processing button {label}: {e}")
+            logger.exception("Error processing button %s: %s", label, e)
         finally:
-            # ALWAYS release the processing lock, even if there was an error
-            with self.processing_lock:
-                self.is_processing = False
-                logger.debug(f"Button {label} processing completed, lock released")
+            logger.debug("Button %s processing completed", label)
+    
+    def _get_plugin_settings(self, refresh_info):
+        """Returns the settings of the playlist plugin instance on display, or None if unknown"""
+        if not refresh_info.playlist or not refresh_info.plugin_instance:
+            return None
+        
+        playlist = self.device_config.get_playlist_manager().get_playlist(refresh_info.playlist)
+        if not playlist:
+            return None
+        
+        plugin_instance = playlist.find_plugin(refresh_info.plugin_id, refresh_info.plugin_instance)
+        return plugin_instance.settings if plugin_instance else None
+    
+    def _post_display_update(self, image, refresh_info):
+        """Updates the image hash in refresh_info and schedules the config write"""
+        try:
+            refresh_info.image_hash = compute_image_hash(image)
+            self._schedule_config_write()
+        except Exception as e:
+            logger.exception("Error updating refresh info after button press: %s", e)
+    
+    def _schedule_config_write(self):
+        """Marks the config as dirty and (re)arms the timer that writes it to disk"""
+        with self._config_lock:
+            self._config_dirty = True
+            if self._config_timer:
+                self._config_timer.cancel()
+            self._config_timer = threading.Timer(self.CONFIG_FLUSH_DELAY, self._flush_config)
+            self._config_timer.daemon = True
+            self._config_timer.start()
+    
+    def _flush_config(self):
+        """Writes the device config if a button press left it dirty"""
+        with self._config_lock:
+            if self._config_timer:
+                self._config_timer.cancel()
+                self._config_timer = None
+            if not self._config_dirty:
+                return
+            self._config_dirty = False
+            try:
+                self.device_config.write_config()
+            except Exception as e:
+                logger.exception("Error writing config after button press: %s", e)
     
     def simulate_button_press(self, button_label):
         """
@@ -249,7 +372,13 @@ class ButtonHandler:
             button_label: 'A', 'B', 'C', or 'D'
         """
         if button_label not in self.LABELS:
-            logger.error(f"Invalid button label: {button_label}")
+            logger.error("Invalid button label: %s", button_label)
+            return
+        
+        offset = self._label_to_offset.get(button_label)
+        if offset is None:
+            logger.error("Cannot simulate button %s: GPIO not configured", button_label)
             return
         
-        logger.info(f"Simulating button press: {button_label}")
+        logger.info("Simulating button press: %s", button_label)
+        self._handle_button_event(SimulatedEvent(offset))
@@ -103,7 +103,7 @@ class BasePlugin:
 
         return take_screenshot_html(rendered_html, dimensions)
 
-    def handle_button(self, button_name, device_config):
+    def handle_button(self, button_name, device_config, settings=None):
         """
         Maneja la pulsación de un botón cuando este plugin está activo.
 
@@ -112,6 +112,7 @@ class BasePlugin:
         Args:
             button_name (str): Nombre del botón presionado ('A', 'B', 'C', 'D')
             device_config: Configuración del dispositivo
+            settings (dict): Settings de la instancia del plugin mostrada, o None si no se conocen
 
         Returns:
             PIL.Image: Nueva imagen para mostrar (si se debe actualizar el display)
@@ -1,23 +1,53 @@
+import hashlib
 import logging
-from random import choice
-
+import math
+import os
+import random
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import ijson
 from PIL import Image, ImageColor, ImageOps
+from utils.app_utils import resolve_path
 from utils.http_client import get_http_session
 from plugins.base_plugin.base_plugin import BasePlugin
 from utils.image_utils import pad_image_blur
 
 logger = logging.getLogger(__name__)
 
+IMAGE_CACHE_DIR = resolve_path(os.path.join("static", "images", "plugins", "image_album_cache"))
+
 
 class ImmichProvider:
+    PAGE_SIZE = 1000
+    # Parallel page requests when the album spans several pages
+    MAX_PAGE_WORKERS = 4
+    # Seconds an album listing is reused before it is fetched again
+    ALBUM_CACHE_TTL = 600
+    # Number of recently shown assets to avoid when picking the next one
+    RECENT_ASSETS = 10
+    # Resized images kept on disk, least recently used are evicted first
+    IMAGE_CACHE_SIZE = 50
+
     def __init__(self, base_url: str, key: str, image_loader):
         self.base_url = base_url
         self.key = key
         self.headers = {"x-api-key": self.key}
         self.image_loader = image_loader
         self.session = get_http_session()
+        # album name -> (album_id, asset_ids, fetched_at)
+        self._album_cache = {}
+        self._rng = random.Random()
+        self._recent = deque(maxlen=self.RECENT_ASSETS)
+
+    def get_album(self, album: str) -> tuple[str, int | None]:
+        """
+        Look up an album by name.
 
-    def get_album_id(self, album: str) -> str:
+        Returns:
+            Tuple of (album id, number of assets in the album or None if not reported)
+        """
         logger.debug(f"Fetching albums from {self.base_url}")
         r = self.session.get(f"{self.base_url}/api/albums", headers=self.headers)
         r.raise_for_status()
@@ -27,31 +57,160 @@ class ImmichProvider:
         if not matching_albums:
             raise RuntimeError(f"Album '{album}' not found.")
 
-        return matching_albums[0]["id"]
+        return matching_albums[0]["id"], matching_albums[0].get("assetCount")
+
+    def _get_assets_page(self, album_id: str, page: int) -> tuple[list[str], int | None]:
+        """
+        Fetch one page of album assets from the search endpoint.
 
-    def get_assets(self, album_id: str) -> list[dict]:
-        """Fetch all assets from album."""
-        all_items = []
-        page_items = [1]
-        page = 1
+        The response is parsed incrementally so only the asset ids (and the next
+        page number) are kept in memory, not the full metadata of every asset.
 
-        logger.debug(f"Fetching assets from album {album_id}")
-        while page_items:
-            body = {
-                "albumIds": [album_id],
-                "size": 1000,
-                "page": page
-            }
-            r2 = self.session.post(f"{self.base_url}/api/search/metadata", json=body, headers=self.headers)
+        Returns:
+            Tuple of (asset ids on this page, next page number or None on the last page)
+        """
+        body = {
+            "albumIds": [album_id],
+            "size": self.PAGE_SIZE,
+            "page": page
+        }
+        asset_ids = []
+        next_page = None
+        with self.session.post(f"{self.base_url}/api/search/metadata", json=body, headers=self.headers, stream=True) as r2:
             r2.raise_for_status()
-            assets_data = r2.json()
+            # Let urllib3 undo gzip/deflate before ijson reads the raw stream
+            r2.raw.decode_content = True
+            for prefix, event, value in ijson.parse(r2.raw):
+                if prefix == "assets.items.item.id":
+                    asset_ids.append(value)
+                elif prefix == "assets.nextPage" and value is not None:
+                    next_page = int(value)
+        return asset_ids, next_page
+
+    def get_assets(self, album_id: str, asset_count: int | None = None) -> list[str]:
+        """
+        Fetch the ids of all assets in the album.
 
-            page_items = assets_data.get("assets", {}).get("items", [])
-            all_items.extend(page_items)
-            page += 1
+        Args:
+            album_id: Album id
+            asset_count: Album size from the album listing, used to fetch pages in parallel
+        """
+        logger.debug(f"Fetching assets from album {album_id}")
 
-        logger.debug(f"Found {len(all_items)} total assets in album")
-        return all_items
+        if asset_count and asset_count > self.PAGE_SIZE:
+            # Page count is known up front, so fetch every page concurrently
+            page_count = math.ceil(asset_count / self.PAGE_SIZE)
+            logger.debug(f"Album has {asset_count} assets, fetching {page_count} pages in parallel")
+            asset_ids = []
+            with ThreadPoolExecutor(max_workers=self.MAX_PAGE_WORKERS) as executor:
+                pages = executor.map(
+                    lambda page: self._get_assets_page(album_id, page),
+                    range(1, page_count + 1)
+                )
+                for page_ids, next_page in pages:
+                    asset_ids.extend(page_ids)
+        else:
+            asset_ids, next_page = self._get_assets_page(album_id, 1)
+
+        # Walk any remaining pages, e.g. when assets were added after the album was listed
+        while next_page:
+            page_ids, next_page = self._get_assets_page(album_id, next_page)
+            asset_ids.extend(page_ids)
+
+        logger.debug(f"Found {len(asset_ids)} total assets in album")
+        return asset_ids
+
+    def get_album_assets(self, album: str) -> list[str]:
+        """Return the album's asset ids, reusing the cached listing while it is fresh."""
+        cached = self._album_cache.get(album)
+        if cached and time.monotonic() - cached[2] < self.ALBUM_CACHE_TTL:
+            logger.debug(f"Using cached asset list for album '{album}' ({len(cached[1])} assets)")
+            return cached[1]
+
+        logger.info(f"Getting id for album '{album}'")
+        album_id, asset_count = self.get_album(album)
+        logger.info(f"Getting assets from album id {album_id}")
+        asset_ids = self.get_assets(album_id, asset_count)
+
+        if asset_ids:
+            self._album_cache[album] = (album_id, asset_ids, time.monotonic())
+        return asset_ids
+
+    def _pick_asset(self, asset_ids: list[str]) -> str:
+        """Pick a random asset id, avoiding recently shown ones when the album allows it."""
+        count = len(asset_ids)
+        asset_id = asset_ids[self._rng.randrange(count)]
+        if count > len(self._recent):
+            # Bounded redraws; a few attempts are enough unless the album is tiny
+            for _ in range(self.RECENT_ASSETS):
+                if asset_id not in self._recent:
+                    break
+                asset_id = asset_ids[self._rng.randrange(count)]
+        self._recent.append(asset_id)
+        return asset_id
+
+    def _cache_path(self, asset_id: str, dimensions: tuple[int, int]) -> str:
+        key = hashlib.blake2b(f"{asset_id}:{dimensions[0]}x{dimensions[1]}".encode(), digest_size=16)
+        return os.path.join(IMAGE_CACHE_DIR, f"{key.hexdigest()}.png")
+
+    def _load_cached_image(self, asset_id: str, dimensions: tuple[int, int]) -> Image.Image | None:
+        """Load a previously resized image from the disk cache, or None on a miss."""
+        path = self._cache_path(asset_id, dimensions)
+        if not os.path.isfile(path):
+            return None
+        try:
+            img = Image.open(path)
+            img.load()
+            # Mark as recently used for eviction
+            os.utime(path)
+            return img
+        except Exception as e:
+            logger.warning(f"Could not read cached image {path}: {e}")
+            return None
+
+    def _store_cached_image(self, asset_id: str, dimensions: tuple[int, int], img: Image.Image):
+        """Save a resized image to the disk cache and evict the least recently used entries."""
+        try:
+            os.makedirs(IMAGE_CACHE_DIR, exist_ok=True)
+            img.save(self._cache_path(asset_id, dimensions), format="PNG")
+
+            entries = [entry for entry in os.scandir(IMAGE_CACHE_DIR) if entry.name.endswith(".png")]
+            if len(entries) > self.IMAGE_CACHE_SIZE:
+                entries.sort(key=lambda entry: entry.stat().st_mtime)
+                for entry in entries[:len(entries) - self.IMAGE_CACHE_SIZE]:
+                    os.unlink(entry.path)
+        except Exception as e:
+            logger.warning(f"Could not cache image for asset {asset_id}: {e}")
+
+    def _load_preview(self, asset_id: str, dimensions: tuple[int, int]) -> Image.Image | None:
+        """
+        Load the server-rendered preview of an asset, resized to dimensions.
+
+        Returns:
+            PIL Image, or None if the preview is unavailable or too small to cover dimensions
+        """
+        preview_url = f"{self.base_url}/api/assets/{asset_id}/thumbnail?size=preview"
+        logger.debug(f"Downloading preview from: {preview_url}")
+
+        img = self.image_loader.from_url(
+            preview_url,
+            dimensions,
+            timeout_ms=40000,
+            resize=False,
+            headers=self.headers
+        )
+        if img is None:
+            logger.debug(f"Preview not available for asset {asset_id}, using original")
+            return None
+
+        if img.size[0] < dimensions[0] or img.size[1] < dimensions[1]:
+            logger.debug(f"Preview {img.size[0]}x{img.size[1]} is smaller than "
+                         f"{dimensions[0]}x{dimensions[1]}, using original")
+            return None
+
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        return ImageOps.fit(img, dimensions, method=Image.Resampling.LANCZOS)
 
     def get_image(self, album: str, dimensions: tuple[int, int], resize: bool = True) -> Image.Image | None:
         """
@@ -66,12 +225,9 @@ class ImmichProvider:
             PIL Image or None on error
         """
         try:
-            logger.info(f"Getting id for album '{album}'")
-            album_id = self.get_album_id(album)
-            logger.info(f"Getting assets from album id {album_id}")
-            assets = self.get_assets(album_id)
+            asset_ids = self.get_album_assets(album)
 
-            if not assets:
+            if not asset_ids:
                 logger.error(f"No assets found in album '{album}'")
                 return None
 
@@ -79,29 +235,42 @@ class ImmichProvider:
             logger.error(f"Error retrieving album data from {self.base_url}: {e}")
             return None
 
-        # Select random asset
-        selected_asset = choice(assets)
-        asset_id = selected_asset["id"]
-        asset_url = f"{self.base_url}/api/assets/{asset_id}/original"
-
+        asset_id = self._pick_asset(asset_ids)
         logger.info(f"Selected random asset: {asset_id}")
-        logger.debug(f"Downloading from: {asset_url}")
 
-        # Use adaptive image loader for memory-efficient processing
-        # Let loader resize when requested (when no padding will be applied)
-        img = self.image_loader.from_url(
-            asset_url,
-            dimensions,
-            timeout_ms=40000,
-            resize=resize,
-            headers=self.headers
-        )
+        img = None
+        if resize:
+            img = self._load_cached_image(asset_id, dimensions)
+            if img is not None:
+                logger.info(f"Using cached image for asset {asset_id}")
+                return img
+
+            # The server-side preview is a fraction of the original's size and decode cost
+            img = self._load_preview(asset_id, dimensions)
+
+        if img is None:
+            asset_url = f"{self.base_url}/api/assets/{asset_id}/original"
+            logger.debug(f"Downloading from: {asset_url}")
+
+            # Use adaptive image loader for memory-efficient processing
+            # Let loader resize when requested (when no padding will be applied)
+            img = self.image_loader.from_url(
+                asset_url,
+                dimensions,
+                timeout_ms=40000,
+                resize=resize,
+                headers=self.headers
+            )
 
         if not img:
             logger.error(f"Failed to load image {asset_id} from Immich")
+            # The asset may have been removed, refresh the listing next time
+            self._album_cache.pop(album, None)
             return None
 
         logger.info(f"Successfully loaded image: {img.size[0]}x{img.size[1]}")
+        if resize:
+            self._store_cached_image(asset_id, dimensions, img)
         return img
 
 
@@ -111,6 +280,8 @@ class ImageAlbum(BasePlugin):
         super().__init__(*args, **kwargs)
         # Caché de settings para usar en handle_button
         self.cached_settings = None
+        # Provider reutilizado entre llamadas para conservar su caché de álbumes
+        self.provider = None
     
     def generate_settings_template(self):
         template_params = super().generate_settings_template()
@@ -163,7 +334,9 @@ class ImageAlbum(BasePlugin):
                 logger.info(f"Immich URL: {url}")
                 logger.info(f"Album: {album}")
 
-                provider = ImmichProvider(url, key, self.image_loader)
+                if self.provider is None or (self.provider.base_url, self.provider.key) != (url, key):
+                    self.provider = ImmichProvider(url, key, self.image_loader)
+                provider = self.provider
                 # Let loader resize when no padding needed, otherwise load full-size for padding
                 img = provider.get_image(album, dimensions, resize=not use_padding)
 
@@ -181,6 +354,14 @@ class ImageAlbum(BasePlugin):
         # Apply padding if requested (image was loaded at full size)
         if use_padding:
             logger.debug(f"Applying padding with {background_option} background")
+
+            # Convert once and cheaply shrink to ~2x the target so the final
+            # LANCZOS/blur passes work on far fewer pixels than the original
+            if img.mode != "RGB":
+                img = img.convert("RGB")
+            img.thumbnail((dimensions[0] * 2, dimensions[1] * 2), Image.Resampling.BILINEAR)
+            logger.debug(f"Prescaled image to {img.size[0]}x{img.size[1]} before padding")
+
             if background_option == "blur":
                 img = pad_image_blur(img, dimensions)
             else:
@@ -194,7 +375,7 @@ class ImageAlbum(BasePlugin):
         logger.info("=== Image Album Plugin: Image generation complete ===")
         return img
 
-    def handle_button(self, button_name, device_config):
+    def handle_button(self, button_name, device_config, settings=None):
         """
         Manages buttons for Image Album:
 
@@ -203,41 +384,14 @@ class ImageAlbum(BasePlugin):
         """
         logger.info(f"ImageAlbum manejando botón {button_name}")
 
-        # SOLUCIÓN: Usar settings cacheados del último generate_image
-        # Esto funciona porque generate_image siempre se llama antes de handle_button
-        settings = self.cached_settings
-        
+        # Settings de la instancia activa (resueltos por ButtonHandler); si no llegan,
+        # usar los cacheados del último generate_image (p. ej. tras un Manual Update)
+        settings = settings or self.cached_settings
+
         if not settings:
-            logger.error("No hay settings cacheados. generate_image debe ejecutarse primero.")
-            logger.info("Intentando obtener settings desde refresh_info...")
-            
-            # Fallback: intentar obtener desde refresh_info
-            try:
-                refresh_info = device_config.get_refresh_info()
-                playlist_manager = device_config.get_playlist_manager()
-                
-                if hasattr(refresh_info, 'plugin_instance') and playlist_manager:
-                    plugin_instance_name = refresh_info.plugin_instance
-                    
-                    if playlist_manager.active_playlist:
-                        active_playlist = playlist_manager.get_playlist(playlist_manager.active_playlist)
-                        
-                        if active_playlist:
-                            # Buscar la instancia del plugin en la playlist
-                            for plugin_inst in active_playlist.plugins:
-                                if plugin_inst.name == plugin_instance_name:
-                                    settings = plugin_inst.settings
-                                    logger.info(f"Settings recuperados desde playlist: {plugin_instance_name}")
-                                    break
-                
-                if not settings:
-                    logger.error("No se pudieron recuperar settings. Abortando.")
-                    return None
-                    
-            except Exception as e:
-                logger.error(f"Error recuperando settings: {e}")
-                return None
-        
+            logger.error("No hay settings disponibles. generate_image debe ejecutarse primero.")
+            return None
+
         logger.debug(f"Settings: albumProvider={settings.get('albumProvider')}, album={settings.get('album')}")
 
         # Botón A: Nueva imagen aleatoria
@@ -5,7 +5,11 @@ import requests
 import logging
 from datetime import datetime, timedelta, timezone, date
 from astral import moon
-from .weather_i18n import WeatherI18n
+from .weather_i18n import (
+    get_i18n,
+    KEY_FEELS_LIKE, KEY_SUNRISE, KEY_SUNSET, KEY_HUMIDITY, KEY_WIND,
+    KEY_PRESSURE, KEY_UV_INDEX, KEY_VISIBILITY, KEY_AIR_QUALITY, KEY_LAST_REFRESH,
+)
 import pytz
 from io import BytesIO
 import math
@@ -90,7 +94,7 @@ class Weather(BasePlugin):
         tz = pytz.timezone(timezone)
 
  	# Initialize i18n using system locale (configured in inkypi.py
-        i18n = WeatherI18n()
+        i18n = get_i18n()
 
         try:
             if weather_provider == "OpenWeatherMap":
@@ -131,8 +135,8 @@ class Weather(BasePlugin):
         now = datetime.now(tz)
         last_refresh_time = i18n.format_last_refresh(now, time_format)
         template_params["last_refresh_time"] = last_refresh_time
-        template_params["i18n_last_refresh"] = i18n.translate('last_refresh')
-        template_params["i18n_feels_like"] = i18n.translate('feels_like')
+        template_params["i18n_last_refresh"] = i18n.translate(KEY_LAST_REFRESH)
+        template_params["i18n_feels_like"] = i18n.translate(KEY_FEELS_LIKE)
         
         image = self.render_image(dimensions, "weather.html", "weather.css", template_params)
 
@@ -476,7 +480,7 @@ class Weather(BasePlugin):
         if sunrise_epoch:
             sunrise_dt = datetime.fromtimestamp(sunrise_epoch, tz=timezone.utc).astimezone(tz)
             data_points.append({
-                "label":  i18n.translate('sunrise'),
+                "label":  i18n.translate(KEY_SUNRISE),
                 "measurement": self.format_time(sunrise_dt, time_format, include_am_pm=False),
                 "unit": "" if time_format == "24h" else sunrise_dt.strftime('%p'),
                 "icon": self.get_plugin_dir('icons/sunrise.png')
@@ -488,7 +492,7 @@ class Weather(BasePlugin):
         if sunset_epoch:
             sunset_dt = datetime.fromtimestamp(sunset_epoch, tz=timezone.utc).astimezone(tz)
             data_points.append({
-                "label":  i18n.translate('sunset'),
+                "label":  i18n.translate(KEY_SUNSET),
                 "measurement": self.format_time(sunset_dt, time_format, include_am_pm=False),
                 "unit": "" if time_format == "24h" else sunset_dt.strftime('%p'),
                 "icon": self.get_plugin_dir('icons/sunset.png')
@@ -499,7 +503,7 @@ class Weather(BasePlugin):
         wind_deg = weather.get('current', {}).get("wind_deg", 0)
         wind_arrow = self.get_wind_arrow(wind_deg)
         data_points.append({
-            "label":  i18n.translate('wind'),
+            "label":  i18n.translate(KEY_WIND),
             "measurement": weather.get('current', {}).get("wind_speed"),
             "unit": UNITS[units]["speed"],
             "icon": self.get_plugin_dir('icons/wind.png'),
@@ -507,21 +511,21 @@ class Weather(BasePlugin):
         })
 
         data_points.append({
-            "label":  i18n.translate('humidity'),
+            "label":  i18n.translate(KEY_HUMIDITY),
             "measurement": weather.get('current', {}).get("humidity"),
             "unit": '%',
             "icon": self.get_plugin_dir('icons/humidity.png')
         })
 
         data_points.append({
-            "label":  i18n.translate('pressure'),
+            "label":  i18n.translate(KEY_PRESSURE),
             "measurement": weather.get('current', {}).get("pressure"),
             "unit": 'hPa',
             "icon": self.get_plugin_dir('icons/pressure.png')
         })
 
         data_points.append({
-            "label":  i18n.translate('uv_index'),
+            "label":  i18n.translate(KEY_UV_INDEX),
             "measurement": weather.get('current', {}).get("uvi"),
             "unit": '',
             "icon": self.get_plugin_dir('icons/uvi.png')
@@ -540,7 +544,7 @@ class Weather(BasePlugin):
         if at_max_visibility:
             visibility_str = u"\u2265" + visibility_str
         data_points.append({
-            "label":  i18n.translate('visibility'),
+            "label":  i18n.translate(KEY_VISIBILITY),
             "measurement": visibility_str,
             "unit": UNITS[units]["distance"],
             "icon": self.get_plugin_dir('icons/visibility.png')
@@ -551,7 +555,7 @@ class Weather(BasePlugin):
         scale = i18n.get_air_quality_label(aqi_value)
         
         data_points.append({
-            "label":  i18n.translate('air_quality'),
+            "label":  i18n.translate(KEY_AIR_QUALITY),
             "measurement": aqi,
             "unit": scale,
             "icon": self.get_plugin_dir('icons/aqi.png')
@@ -573,7 +577,7 @@ class Weather(BasePlugin):
         if sunrise_times:
             sunrise_dt = datetime.fromisoformat(sunrise_times[0]).astimezone(tz)
             data_points.append({
-                "label": i18n.translate('sunrise'),
+                "label": i18n.translate(KEY_SUNRISE),
                 "measurement": self.format_time(sunrise_dt, time_format, include_am_pm=False),
                 "unit": "" if time_format == "24h" else sunrise_dt.strftime('%p'),
                 "icon": self.get_plugin_dir('icons/sunrise.png')
@@ -586,7 +590,7 @@ class Weather(BasePlugin):
         if sunset_times:
             sunset_dt = datetime.fromisoformat(sunset_times[0]).astimezone(tz)
             data_points.append({
-                "label": i18n.translate('sunset'),
+                "label": i18n.translate(KEY_SUNSET),
                 "measurement": self.format_time(sunset_dt, time_format, include_am_pm=False),
                 "unit": "" if time_format == "24h" else sunset_dt.strftime('%p'),
                 "icon": self.get_plugin_dir('icons/sunset.png')
@@ -600,7 +604,7 @@ class Weather(BasePlugin):
         wind_arrow = self.get_wind_arrow(wind_deg)
         wind_unit = UNITS[units]["speed"]
         data_points.append({
-            "label":  i18n.translate('wind'), "measurement": wind_speed, "unit": wind_unit,
+            "label":  i18n.translate(KEY_WIND), "measurement": wind_speed, "unit": wind_unit,
             "icon": self.get_plugin_dir('icons/wind.png'), "arrow": wind_arrow
         })
 
@@ -617,7 +621,7 @@ class Weather(BasePlugin):
                 logger.warning(f"Could not parse time string {time_str} for humidity.")
                 continue
         data_points.append({
-            "label":  i18n.translate('humidity'), "measurement": current_humidity, "unit": '%',
+            "label":  i18n.translate(KEY_HUMIDITY), "measurement": current_humidity, "unit": '%',
             "icon": self.get_plugin_dir('icons/humidity.png')
         })
 
@@ -634,7 +638,7 @@ class Weather(BasePlugin):
                 logger.warning(f"Could not parse time string {time_str} for pressure.")
                 continue
         data_points.append({
-            "label":  i18n.translate('pressure'), "measurement": current_pressure, "unit": 'hPa',
+            "label":  i18n.translate(KEY_PRESSURE), "measurement": current_pressure, "unit": 'hPa',
             "icon": self.get_plugin_dir('icons/pressure.png')
         })
 
@@ -651,7 +655,7 @@ class Weather(BasePlugin):
                 logger.warning(f"Could not parse time string {time_str} for UV Index.")
                 continue
         data_points.append({
-            "label": i18n.translate('uv_index'), "measurement": current_uv_index, "unit": '',
+            "label": i18n.translate(KEY_UV_INDEX), "measurement": current_uv_index, "unit": '',
             "icon": self.get_plugin_dir('icons/uvi.png')
         })
 
@@ -678,7 +682,7 @@ class Weather(BasePlugin):
         if at_max_visibility:
             visibility_str = u"\u2265" + visibility_str
         data_points.append({
-            "label": i18n.translate('visibility'), 
+            "label": i18n.translate(KEY_VISIBILITY), 
             "measurement": visibility_str, 
             "unit": UNITS[units]["distance"],
             "icon": self.get_plugin_dir('icons/visibility.png')
@@ -701,7 +705,7 @@ class Weather(BasePlugin):
             aqi_value = min(current_aqi//20, 5) * 20  # Convert to approximate AQI
             scale = i18n.get_air_quality_label(aqi_value)
         data_points.append({
-            "label": i18n.translate('air_quality'), "measurement": current_aqi,
+            "label": i18n.translate(KEY_AIR_QUALITY), "measurement": current_aqi,
             "unit": scale, "icon": self.get_plugin_dir('icons/aqi.png')
         })
 
@@ -4,9 +4,14 @@ Provides locale-aware formatting and translations
 Uses the system locale configured in inkypi.py main
 """
 
+import functools
+import os
+import threading
+from bisect import bisect_right
 import locale as system_locale
-from datetime import datetime
-from typing import Dict, Optional
+from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import Mapping, Optional, Union
 import logging
 
 logger = logging.getLogger(__name__)
@@ -175,23 +180,257 @@ DATE_FORMATS = {
     'pt_PT': ('%A, %d de %B', '%a'),   # sábado, 14 de fevereiro | sáb
 }
 
+# Tables are read-only after import; expose them as immutable views
+TRANSLATIONS = MappingProxyType({
+    locale_key: MappingProxyType(table)
+    for locale_key, table in TRANSLATIONS.items()
+})
+DATE_FORMATS = MappingProxyType(DATE_FORMATS)
+
+# Fixed positions of each key in WeatherI18n's translation tuple; translate(KEY_HUMIDITY)
+# is a tuple index instead of a dict lookup
+TRANSLATION_KEY_ORDER = (
+    'feels_like', 'sunrise', 'sunset', 'humidity', 'wind', 'rain', 'pressure',
+    'uv_index', 'visibility', 'air_quality', 'last_refresh', 'moon_phase',
+    'good', 'fair', 'moderate', 'poor', 'very_poor', 'ext_poor',
+)
+(KEY_FEELS_LIKE, KEY_SUNRISE, KEY_SUNSET, KEY_HUMIDITY, KEY_WIND, KEY_RAIN, KEY_PRESSURE,
+ KEY_UV_INDEX, KEY_VISIBILITY, KEY_AIR_QUALITY, KEY_LAST_REFRESH, KEY_MOON_PHASE,
+ KEY_GOOD, KEY_FAIR, KEY_MODERATE, KEY_POOR, KEY_VERY_POOR, KEY_EXT_POOR) = range(len(TRANSLATION_KEY_ORDER))
+
+# strftime directives that can be rendered from precomputed name tables
+_NAME_DIRECTIVES = frozenset('AaBbd')
+
+# strftime format for the time part of the last refresh line, by time_format setting
+REFRESH_TIME_FORMATS = {
+    '12h': '%I:%M %p',
+    '24h': '%H:%M',
+}
+
+# Upper bounds (exclusive) of each air quality band; labels are KEY_GOOD..KEY_EXT_POOR in order
+AQI_THRESHOLDS = (20, 40, 60, 80, 100)
+
+# Language code -> table of the first locale declared for it (e.g. 'en' -> en_US)
+_LANG_TO_TRANSLATIONS = {k.split('_', 1)[0]: v for k, v in reversed(TRANSLATIONS.items())}
+_LANG_TO_DATE_FORMATS = {k.split('_', 1)[0]: v for k, v in reversed(DATE_FORMATS.items())}
+
+# Every locale named in either table -> its final tables with fallbacks already applied
+# (e.g. en_GB has date formats but no translations of its own, so it maps to en_US's)
+_KNOWN_LOCALES = TRANSLATIONS.keys() | DATE_FORMATS.keys()
+_RESOLVED_TRANSLATIONS = {
+    code: TRANSLATIONS.get(code) or _LANG_TO_TRANSLATIONS.get(code.split('_', 1)[0], TRANSLATIONS['en_US'])
+    for code in _KNOWN_LOCALES
+}
+_RESOLVED_DATE_FORMATS = {
+    code: DATE_FORMATS.get(code) or _LANG_TO_DATE_FORMATS.get(code.split('_', 1)[0], DATE_FORMATS['en_US'])
+    for code in _KNOWN_LOCALES
+}
+
+# Turns an unknown key like 'wind_speed' into words for the fallback label
+_UNDERSCORE_TBL = str.maketrans('_', ' ')
+
+
+@functools.lru_cache(maxsize=None)
+def _warn_once(msg: str, *args):
+    """Log a fallback warning at most once per process (not cleared by invalidate())"""
+    logger.warning(msg, *args)
+
+
+# Environment variables consulted when LC_TIME is not set, in glibc precedence order
+_LOCALE_ENV_VARS = ('LC_ALL', 'LC_TIME', 'LC_MESSAGES', 'LANG', 'LANGUAGE')
+
+
+def _normalize_locale(value: Optional[str]) -> Optional[str]:
+    """
+    Reduce a locale string to its 'll_CC' code
+    
+    Handles encodings/modifiers ('es_ES.UTF-8@euro'), glibc composite strings
+    ('LC_CTYPE=en_US.UTF-8;LC_TIME=es_ES.UTF-8', where the LC_TIME category wins)
+    and LANGUAGE lists ('es:en').
+    
+    Returns:
+        Locale code, or None for empty, 'C' and 'POSIX' locales
+    """
+    if not value:
+        return None
+    if '=' in value:
+        categories = dict(part.split('=', 1) for part in value.split(';') if '=' in part)
+        value = categories.get('LC_TIME') or next(iter(categories.values()))
+    else:
+        value = value.split(':', 1)[0]
+    value = value.split('.', 1)[0].split('@', 1)[0]
+    if value in ('', 'C', 'POSIX'):
+        return None
+    return value
+
+
+@functools.lru_cache(maxsize=1)
+def _detect_locale() -> str:
+    """
+    Get the system locale that was configured in inkypi.py
+    
+    Uses the active LC_TIME locale first, since that is what strftime formats with,
+    then falls back to the locale environment variables.
+    
+    Returns:
+        Locale code like 'es_ES'
+    """
+    try:
+        # Get locale from system (already set in inkypi.py)
+        locale_code = _normalize_locale(system_locale.getlocale(system_locale.LC_TIME)[0])
+        if locale_code:
+            logger.debug("Detected system locale: %s", locale_code)
+            return locale_code
+    except Exception as e:
+        logger.warning("Could not get system locale: %s", e)
+    
+    for var in _LOCALE_ENV_VARS:
+        locale_code = _normalize_locale(os.environ.get(var))
+        if locale_code:
+            logger.debug("Detected locale from %s: %s", var, locale_code)
+            return locale_code
+    
+    # Fallback to English if can't detect
+    _warn_once("Using fallback locale: en_US")
+    return 'en_US'
+
+
+def _compile_date_format(fmt: str) -> Optional[str]:
+    """
+    Convert a strftime format into a str.format template over name tables
+    
+    Only %A, %a, %B, %b, %d and %% are supported, which covers every DATE_FORMATS entry.
+    
+    Returns:
+        Template with {A}, {a}, {B}, {b} and {d:02d} fields, or None if the format
+        uses any other directive (callers then fall back to strftime)
+    """
+    parts = []
+    i = 0
+    while i < len(fmt):
+        ch = fmt[i]
+        if ch != '%':
+            parts.append('{{' if ch == '{' else '}}' if ch == '}' else ch)
+            i += 1
+            continue
+        directive = fmt[i + 1:i + 2]
+        if directive == '%':
+            parts.append('%')
+        elif directive == 'd':
+            parts.append('{d:02d}')
+        elif directive in _NAME_DIRECTIVES:
+            parts.append('{' + directive + '}')
+        else:
+            return None
+        i += 2
+    return ''.join(parts)
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_translations(locale_code: str, lang_code: str) -> Mapping:
+    """
+    Get translations for a locale with fallback
+    
+    Returns:
+        Translation dictionary
+    """
+    # Known locale (e.g., 'es_ES')
+    translations = _RESOLVED_TRANSLATIONS.get(locale_code)
+    if translations is not None:
+        return translations
+    
+    # Language-only match (e.g., 'es' from 'es_PE')
+    translations = _LANG_TO_TRANSLATIONS.get(lang_code)
+    if translations is not None:
+        return translations
+    
+    _warn_once("No translations found for %s, using English", locale_code)
+    return TRANSLATIONS['en_US']
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_date_formats(locale_code: str, lang_code: str) -> tuple:
+    """
+    Get date formats for a locale with fallback
+    
+    Returns:
+        Tuple of (current_date_format, short_day_format)
+    """
+    # Known locale
+    date_formats = _RESOLVED_DATE_FORMATS.get(locale_code)
+    if date_formats is not None:
+        return date_formats
+    
+    # Language-only match
+    date_formats = _LANG_TO_DATE_FORMATS.get(lang_code)
+    if date_formats is not None:
+        return date_formats
+    
+    _warn_once("No date formats found for %s, using English", locale_code)
+    return DATE_FORMATS['en_US']
+
 
 class WeatherI18n:
     """
     Internationalization handler for Weather plugin
     Uses the system locale configured in inkypi.py
+    
+    Callers should use get_i18n() to share a single instance instead of
+    constructing one per render. Call reset_i18n() after changing the locale.
     """
     
+    __slots__ = (
+        'locale_code', 'lang_code', 'translations', 'date_formats',
+        '_tr_get', '_tr_tuple', '_miss_cache',
+        '_fmt_current', '_fmt_short', '_current_date_tpl',
+        '_day_names', '_short_day_names', '_short_days', '_month_names', '_short_month_names',
+        '_aqi_labels', '_refresh_date_fmt', '_refresh_fmts',
+    )
+    
     def __init__(self):
         """
         Initialize i18n handler using system locale
         The locale should already be set in inkypi.py via setup_locale()
         """
         self.locale_code = self._get_system_locale()
+        self.lang_code = self.locale_code.split('_', 1)[0]
         self.translations = self._get_translations()
+        self._tr_get = self.translations.get
+        # Fallback labels for keys missing from the translations
+        self._miss_cache = {}
+        self._tr_tuple = tuple(self.translate(key) for key in TRANSLATION_KEY_ORDER)
         self.date_formats = self._get_date_formats()
+        self._fmt_current, self._fmt_short = self.date_formats
+        # Day/month names from the system locale, rendered once (Monday first, January first)
+        monday = datetime(2024, 1, 1)
+        days = [monday + timedelta(days=i) for i in range(7)]
+        months = [datetime(2024, month, 1) for month in range(1, 13)]
+        self._day_names = tuple(day.strftime('%A') for day in days)
+        self._short_day_names = tuple(day.strftime('%a') for day in days)
+        self._month_names = tuple(month.strftime('%B') for month in months)
+        self._short_month_names = tuple(month.strftime('%b') for month in months)
+        # format_short_day() output by weekday; the short day format is '%a' for every
+        # DATE_FORMATS entry, so this is normally the same table as _short_day_names
+        if self._fmt_short == '%a':
+            self._short_days = self._short_day_names
+        else:
+            self._short_days = tuple(day.strftime(self._fmt_short) for day in days)
+        self._current_date_tpl = _compile_date_format(self._fmt_current)
+        self._aqi_labels = self._tr_tuple[KEY_GOOD:KEY_EXT_POOR + 1]
+        # English locales use ISO dates, most others prefer DD/MM/YYYY
+        self._refresh_date_fmt = "%Y-%m-%d" if self.lang_code == 'en' else "%d/%m/%Y"
+        self._refresh_fmts = {
+            name: f"{self._refresh_date_fmt} {time_fmt}" for name, time_fmt in REFRESH_TIME_FORMATS.items()
+        }
         
-        logger.info(f"Weather i18n initialized with locale: {self.locale_code}")
+        logger.debug("Weather i18n initialized with locale: %s", self.locale_code)
+    
+    @classmethod
+    def invalidate(cls):
+        """Clear cached locale detection and tables (e.g. after setlocale)"""
+        _detect_locale.cache_clear()
+        _resolve_translations.cache_clear()
+        _resolve_date_formats.cache_clear()
     
     def _get_system_locale(self) -> str:
         """
@@ -200,43 +439,16 @@ class WeatherI18n:
         Returns:
             Locale code like 'es_ES'
         """
-        try:
-            # Get locale from system (already set in inkypi.py)
-            loc = system_locale.getlocale(system_locale.LC_TIME)
-            
-            if loc and loc[0]:
-                locale_code = loc[0]
-                logger.debug(f"Detected system locale: {locale_code}")
-                return locale_code
-            
-        except Exception as e:
-            logger.warning(f"Could not get system locale: {e}")
-        
-        # Fallback to English if can't detect
-        logger.warning("Using fallback locale: en_US")
-        return 'en_US'
+        return _detect_locale()
     
-    def _get_translations(self) -> Dict:
+    def _get_translations(self) -> Mapping:
         """
         Get translations for current locale with fallback
         
         Returns:
             Translation dictionary
         """
-        # Try exact match first (e.g., 'es_ES')
-        if self.locale_code in TRANSLATIONS:
-            return TRANSLATIONS[self.locale_code]
-        
-        # Try language-only match (e.g., 'es' from 'es_ES')
-        lang_code = self.locale_code.split('_')[0]
-        for locale_key in TRANSLATIONS:
-            if locale_key.startswith(lang_code):
-                logger.debug(f"Using translations for {locale_key} (from {self.locale_code})")
-                return TRANSLATIONS[locale_key]
-        
-        # Fallback to English
-        logger.warning(f"No translations found for {self.locale_code}, using English")
-        return TRANSLATIONS['en_US']
+        return _resolve_translations(self.locale_code, self.lang_code)
     
     def _get_date_formats(self) -> tuple:
         """
@@ -245,32 +457,28 @@ class WeatherI18n:
         Returns:
             Tuple of (current_date_format, short_day_format)
         """
-        # Try exact match
-        if self.locale_code in DATE_FORMATS:
-            return DATE_FORMATS[self.locale_code]
-        
-        # Try language-only match
-        lang_code = self.locale_code.split('_')[0]
-        for locale_key in DATE_FORMATS:
-            if locale_key.startswith(lang_code):
-                logger.debug(f"Using date formats for {locale_key} (from {self.locale_code})")
-                return DATE_FORMATS[locale_key]
-        
-        # Fallback to English
-        logger.warning(f"No date formats found for {self.locale_code}, using English")
-        return DATE_FORMATS['en_US']
+        return _resolve_date_formats(self.locale_code, self.lang_code)
     
-    def translate(self, key: str) -> str:
+    def translate(self, key: Union[int, str]) -> str:
         """
         Translate a key to current locale
         
         Args:
-            key: Translation key (lowercase with underscores)
+            key: KEY_* constant, or translation key (lowercase with underscores)
         
         Returns:
             Translated string
         """
-        return self.translations.get(key, key.replace('_', ' ').title())
+        if type(key) is int:
+            return self._tr_tuple[key]
+        value = self._tr_get(key)
+        if value is not None:
+            return value
+        # Only build the fallback label on a miss, once per key
+        value = self._miss_cache.get(key)
+        if value is None:
+            value = self._miss_cache[key] = key.translate(_UNDERSCORE_TBL).title()
+        return value
     
     def format_current_date(self, dt: datetime) -> str:
         """
@@ -287,8 +495,17 @@ class WeatherI18n:
             en_US: "Saturday, February 14"
             es_ES: "sábado 14 de febrero"
         """
-        format_str = self.date_formats[0]
-        return dt.strftime(format_str)
+        if self._current_date_tpl is None:
+            return dt.strftime(self._fmt_current)
+        weekday = dt.weekday()
+        month = dt.month - 1
+        return self._current_date_tpl.format(
+            A=self._day_names[weekday],
+            a=self._short_day_names[weekday],
+            B=self._month_names[month],
+            b=self._short_month_names[month],
+            d=dt.day,
+        )
     
     def format_short_day(self, dt: datetime) -> str:
         """
@@ -305,8 +522,7 @@ class WeatherI18n:
             en_US: "Sat"
             es_ES: "sáb"
         """
-        format_str = self.date_formats[1]
-        return dt.strftime(format_str)
+        return self._short_days[dt.weekday()]
     
     def format_last_refresh(self, dt: datetime, time_format: str = "12h") -> str:
         """
@@ -319,20 +535,7 @@ class WeatherI18n:
         Returns:
             Formatted datetime string
         """
-        # Date part depends on locale
-        if self.locale_code.startswith('en'):
-            date_part = dt.strftime("%Y-%m-%d")
-        else:
-            # Most other locales prefer DD-MM-YYYY or DD/MM/YYYY
-            date_part = dt.strftime("%d/%m/%Y")
-        
-        # Time part depends on format preference
-        if time_format == "24h":
-            time_part = dt.strftime("%H:%M")
-        else:
-            time_part = dt.strftime("%I:%M %p")
-        
-        return f"{date_part} {time_part}"
+        return dt.strftime(self._refresh_fmts.get(time_format) or self._refresh_fmts['12h'])
     
     def get_air_quality_label(self, aqi_value: float) -> str:
         """
@@ -344,15 +547,40 @@ class WeatherI18n:
         Returns:
             Translated quality label
         """
-        if aqi_value < 20:
-            return self.translate('good')
-        elif aqi_value < 40:
-            return self.translate('fair')
-        elif aqi_value < 60:
-            return self.translate('moderate')
-        elif aqi_value < 80:
-            return self.translate('poor')
-        elif aqi_value < 100:
-            return self.translate('very_poor')
-        else:
-            return self.translate('ext_poor')
+        # bisect_right keeps the '<' boundaries: 20 is 'fair', 100 is 'ext_poor'
+        return self._aqi_labels[bisect_right(AQI_THRESHOLDS, aqi_value)]
+
+
+_instance: Optional[WeatherI18n] = None
+_instance_lock = threading.Lock()
+
+
+def get_i18n() -> WeatherI18n:
+    """
+    Get the shared WeatherI18n instance.
+    Creates it on first call (lazy, thread-safe initialization).
+    
+    Returns:
+        WeatherI18n: Shared instance for the current system locale
+    """
+    global _instance
+    
+    instance = _instance
+    if instance is None:
+        with _instance_lock:
+            if _instance is None:
+                _instance = WeatherI18n()
+            instance = _instance
+    return instance
+
+
+def reset_i18n():
+    """
+    Drop the shared instance and cached locale data.
+    The next get_i18n() re-detects the locale (use after setlocale or in tests).
+    """
+    global _instance
+    
+    with _instance_lock:
+        _instance = None
+        WeatherI18n.invalidate()
@@ -8,6 +8,7 @@ and high-performance strategies on capable devices (Pi 3/4).
 
 from PIL import Image, ImageOps
 from io import BytesIO
+import requests
 from utils.http_client import get_http_session
 import logging
 import gc
@@ -242,6 +243,12 @@ class AdaptiveImageLoader:
             logger.info(f"Downloaded image: {original_size[0]}x{original_size[1]} ({img.mode} mode, {original_pixels/1_000_000:.1f}MP)")
 
             if resize:
+                if img.format == 'JPEG':
+                    # Let libjpeg decode at a reduced DCT scale, still >= 2x the target size
+                    img.draft('RGB', (dimensions[0] * 2, dimensions[1] * 2))
+                    img.load()
+                    logger.debug(f"JPEG draft decode: {img.size[0]}x{img.size[1]} (from {original_size[0]}x{original_size[1]})")
+
                 img = self._process_and_resize(img, dimensions, original_size)
             else:
                 # Even without resizing, apply EXIF orientation correction
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Plugins and utils import each other as top-level packages (see scripts/venv.sh)
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC_DIR not in sys.path:
+    sys.path.append(SRC_DIR)
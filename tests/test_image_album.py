@@ -0,0 +1,187 @@
+import json
+import os
+import threading
+from io import BytesIO
+
+import pytest
+import requests
+from PIL import Image
+
+from plugins.image_album import image_album
+from utils import image_loader
+from utils.image_loader import AdaptiveImageLoader
+
+BASE_URL = "http://immich.local"
+
+
+def _png_bytes(size):
+    buf = BytesIO()
+    Image.new("RGB", size, "red").save(buf, format="PNG")
+    return buf.getvalue()
+
+
+class FakeResponse:
+    def __init__(self, url, status_code=200, content=b""):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} for {self.url}")
+
+    def iter_content(self, chunk_size=8192):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+
+class FakeStreamResponse(FakeResponse):
+    def __init__(self, url, data):
+        super().__init__(url)
+        self.raw = BytesIO(json.dumps(data).encode())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class FakeSession:
+    """
+    Serves a 404 for asset previews, a small PNG for originals and
+    album_size assets through the paged search endpoint
+    """
+
+    def __init__(self, album_size=0, page_size=10):
+        self.requested = []
+        self.pages = []
+        self.page_threads = set()
+        self.album_size = album_size
+        self.page_size = page_size
+
+    def get(self, url, **kwargs):
+        self.requested.append(url)
+        if "size=preview" in url:
+            return FakeResponse(url, status_code=404)
+        return FakeResponse(url, content=_png_bytes((40, 30)))
+
+    def post(self, url, json=None, **kwargs):
+        page, size = json["page"], json["size"]
+        self.pages.append(page)
+        self.page_threads.add(threading.current_thread())
+        ids = [f"asset-{i}" for i in range((page - 1) * size, min(page * size, self.album_size))]
+        next_page = str(page + 1) if page * size < self.album_size else None
+        return FakeStreamResponse(url, {
+            "albums": {"total": 0, "count": 0, "items": [], "facets": []},
+            "assets": {
+                "total": len(ids),
+                "count": len(ids),
+                "items": [{"id": asset_id, "type": "IMAGE", "exifInfo": {"city": None}} for asset_id in ids],
+                "facets": [],
+                "nextPage": next_page,
+            },
+        })
+
+
+class ScriptedRandom:
+    """Stands in for random.Random, returning preset indexes from randrange()"""
+
+    def __init__(self, draws):
+        self.draws = iter(draws)
+
+    def randrange(self, stop):
+        return next(self.draws)
+
+
+class TestImmichProvider:
+
+    @pytest.mark.parametrize("low_resource", [False, True])
+    def test_missing_preview_falls_back_to_original(self, monkeypatch, tmp_path, low_resource):
+        session = FakeSession()
+        monkeypatch.setattr(image_album, "get_http_session", lambda: session)
+        monkeypatch.setattr(image_loader, "get_http_session", lambda: session)
+        monkeypatch.setattr(image_album, "IMAGE_CACHE_DIR", str(tmp_path))
+
+        loader = AdaptiveImageLoader()
+        loader.is_low_resource = low_resource
+        provider = image_album.ImmichProvider(BASE_URL, "key", loader)
+        monkeypatch.setattr(provider, "get_album_assets", lambda album: ["asset-1"])
+
+        img = provider.get_image("Album", (20, 15))
+
+        assert img is not None
+        assert img.size == (20, 15)
+        assert session.requested == [
+            f"{BASE_URL}/api/assets/asset-1/thumbnail?size=preview",
+            f"{BASE_URL}/api/assets/asset-1/original",
+        ]
+
+    @pytest.mark.parametrize(
+        "album_size,asset_count,expected_pages,parallel",
+        [
+            # --- Count unknown: follow nextPage ---
+            (25, None, [1, 2, 3], False),
+            (20, None, [1, 2], False),
+            # --- Fits in one page ---
+            (8, 8, [1], False),
+            (0, 0, [1], False),
+            # --- Several pages: fetched in parallel ---
+            (25, 25, [1, 2, 3], True),
+            # --- Stale count: parallel pages, then continue from nextPage ---
+            (25, 15, [1, 2, 3], True),
+        ],
+    )
+    def test_get_assets_pages(self, monkeypatch, album_size, asset_count, expected_pages, parallel):
+        session = FakeSession(album_size=album_size)
+        monkeypatch.setattr(image_album, "get_http_session", lambda: session)
+        monkeypatch.setattr(image_album.ImmichProvider, "PAGE_SIZE", session.page_size)
+        provider = image_album.ImmichProvider(BASE_URL, "key", None)
+
+        asset_ids = provider.get_assets("album-1", asset_count)
+
+        assert asset_ids == [f"asset-{i}" for i in range(album_size)]
+        assert sorted(session.pages) == expected_pages
+        assert (session.page_threads != {threading.current_thread()}) == parallel
+
+    def _provider(self, monkeypatch, tmp_path=None):
+        session = FakeSession()
+        monkeypatch.setattr(image_album, "get_http_session", lambda: session)
+        if tmp_path is not None:
+            monkeypatch.setattr(image_album, "IMAGE_CACHE_DIR", str(tmp_path))
+        return image_album.ImmichProvider(BASE_URL, "key", None)
+
+    def test_pick_asset_avoids_recent_assets(self, monkeypatch):
+        provider = self._provider(monkeypatch)
+        provider._rng = ScriptedRandom([0, 0, 0, 1])
+        asset_ids = ["asset-0", "asset-1", "asset-2"]
+
+        assert provider._pick_asset(asset_ids) == "asset-0"
+        # asset-0 was just shown, so it is redrawn until another asset comes up
+        assert provider._pick_asset(asset_ids) == "asset-1"
+
+    def test_pick_asset_repeats_in_tiny_album(self, monkeypatch):
+        provider = self._provider(monkeypatch)
+
+        assert [provider._pick_asset(["asset-0"]) for _ in range(3)] == ["asset-0"] * 3
+
+    def test_image_cache_evicts_least_recently_used(self, monkeypatch, tmp_path):
+        provider = self._provider(monkeypatch, tmp_path)
+        monkeypatch.setattr(image_album.ImmichProvider, "IMAGE_CACHE_SIZE", 3)
+        dimensions = (8, 6)
+        img = Image.new("RGB", dimensions, "blue")
+
+        for i in range(3):
+            provider._store_cached_image(f"asset-{i}", dimensions, img)
+            # Spread mtimes out so eviction order doesn't depend on timestamp resolution
+            os.utime(provider._cache_path(f"asset-{i}", dimensions), (1000 + i, 1000 + i))
+
+        # A hit marks asset-0 as recently used, leaving asset-1 as the oldest entry
+        assert provider._load_cached_image("asset-0", dimensions) is not None
+        assert os.path.getmtime(provider._cache_path("asset-0", dimensions)) > 1002
+
+        provider._store_cached_image("asset-3", dimensions, img)
+
+        cached = {f"asset-{i}": os.path.isfile(provider._cache_path(f"asset-{i}", dimensions)) for i in range(4)}
+        assert cached == {"asset-0": True, "asset-1": False, "asset-2": True, "asset-3": True}
+        assert provider._load_cached_image("asset-1", dimensions) is None
@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from plugins.weather import weather_i18n
+from plugins.weather.weather_i18n import (
+    DATE_FORMATS,
+    WeatherI18n,
+    _compile_date_format,
+    _detect_locale,
+    _normalize_locale,
+)
+
+
+class TestNormalizeLocale:
+
+    @pytest.mark.parametrize(
+        "value,expected",
+        [
+            ("es_ES", "es_ES"),
+            ("es_ES.UTF-8", "es_ES"),
+            ("es_ES.UTF-8@euro", "es_ES"),
+            ("ca_ES@valencia", "ca_ES"),
+            # --- LANGUAGE lists: first entry wins ---
+            ("es:en", "es"),
+            ("pt_PT:pt:en", "pt_PT"),
+            # --- glibc composite strings: LC_TIME wins, else the first category ---
+            ("LC_CTYPE=en_US.UTF-8;LC_TIME=es_ES.UTF-8", "es_ES"),
+            ("LC_CTYPE=fr_FR.UTF-8;LC_NUMERIC=C", "fr_FR"),
+            # --- No usable locale ---
+            (None, None),
+            ("", None),
+            ("C", None),
+            ("C.UTF-8", None),
+            ("POSIX", None),
+        ],
+    )
+    def test_normalize_locale(self, value, expected):
+        assert _normalize_locale(value) == expected
+
+
+class TestDetectLocale:
+
+    @pytest.fixture(autouse=True)
+    def clean_environment(self, monkeypatch):
+        for var in weather_i18n._LOCALE_ENV_VARS:
+            monkeypatch.delenv(var, raising=False)
+        monkeypatch.setattr(weather_i18n.system_locale, "getlocale", lambda category=None: (None, None))
+        _detect_locale.cache_clear()
+        yield
+        _detect_locale.cache_clear()
+
+    @pytest.mark.parametrize(
+        "env,expected",
+        [
+            ({"LANG": "fr_FR.UTF-8"}, "fr_FR"),
+            ({"LANG": "fr_FR.UTF-8", "LC_MESSAGES": "it_IT.UTF-8"}, "it_IT"),
+            ({"LANG": "fr_FR.UTF-8", "LC_TIME": "de_DE.UTF-8"}, "de_DE"),
+            ({"LC_TIME": "de_DE.UTF-8", "LC_ALL": "es_ES.UTF-8"}, "es_ES"),
+            ({"LC_ALL": "C", "LANG": "pt_PT.UTF-8"}, "pt_PT"),
+            ({"LANGUAGE": "ca:es"}, "ca"),
+            ({}, "en_US"),
+        ],
+    )
+    def test_env_var_precedence(self, monkeypatch, env, expected):
+        for var, value in env.items():
+            monkeypatch.setenv(var, value)
+        assert _detect_locale() == expected
+
+    def test_active_locale_wins_over_environment(self, monkeypatch):
+        monkeypatch.setenv("LC_ALL", "es_ES.UTF-8")
+        monkeypatch.setattr(weather_i18n.system_locale, "getlocale", lambda category=None: ("de_DE", "UTF-8"))
+        assert _detect_locale() == "de_DE"
+
+
+class TestCompileDateFormat:
+
+    @pytest.mark.parametrize(
+        "fmt,expected",
+        [
+            ("%A, %B %d", "{A}, {B} {d:02d}"),
+            ("%a %b", "{a} {b}"),
+            ("%d%%", "{d:02d}%"),
+            ("{%d}", "{{{d:02d}}}"),
+            ("", ""),
+            # --- Unsupported directives fall back to strftime ---
+            ("%d %Y", None),
+            ("%A %", None),
+        ],
+    )
+    def test_compile_date_format(self, fmt, expected):
+        assert _compile_date_format(fmt) == expected
+
+    def test_literal_braces_render(self):
+        template = _compile_date_format("{%d}")
+        assert template.format(d=5) == "{05}"
+
+
+class TestFormatDates:
+
+    # Every day of a leap year, so all weekdays, months and day numbers are covered
+    DATES = [datetime(2024, 1, 1) + timedelta(days=i) for i in range(366)]
+
+    @pytest.fixture
+    def i18n_for(self, monkeypatch):
+        def make(locale_code):
+            monkeypatch.setattr(weather_i18n, "_detect_locale", lambda: locale_code)
+            return WeatherI18n()
+        return make
+
+    @pytest.mark.parametrize("locale_code", sorted(DATE_FORMATS))
+    def test_format_current_date_matches_strftime(self, i18n_for, locale_code):
+        i18n = i18n_for(locale_code)
+        fmt = DATE_FORMATS[locale_code][0]
+        for dt in self.DATES:
+            assert i18n.format_current_date(dt) == dt.strftime(fmt)
+
+    @pytest.mark.parametrize("locale_code", sorted(DATE_FORMATS))
+    def test_format_short_day_matches_strftime(self, i18n_for, locale_code):
+        i18n = i18n_for(locale_code)
+        fmt = DATE_FORMATS[locale_code][1]
+        for dt in self.DATES[:7]:
+            assert i18n.format_short_day(dt) == dt.strftime(fmt)